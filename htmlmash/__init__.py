@@ -4,15 +4,16 @@ import sys
 import types
 
 from htmlmash import _importer, _element
-from htmlmash._element import Element
+from htmlmash._element import Element, Slot, Fill
 from htmlmash._importer import load_template
 
-__all__ = ["Element"]
+__all__ = ["Element", "Slot", "Fill"]
 
 
 importer_enabled = True
 importer_source_suffix = '.hpy'
 importer_bytecode_suffix = '.hpyc'
+importer_bytecode_enabled = True
 
 class Module(types.ModuleType):
     def __init__(self):
@@ -55,4 +56,13 @@ class Module(types.ModuleType):
         assert isinstance(value, str)
         _importer.BYTECODE_SUFFIX = value
 
+    @property
+    def importer_bytecode_enabled(self):
+        return _importer.BYTECODE_ENABLED
+
+    @importer_bytecode_enabled.setter
+    def importer_bytecode_enabled(self, value):
+        assert isinstance(value, bool)
+        _importer.BYTECODE_ENABLED = value
+
 sys.modules[__name__] = Module()
@@ -1,11 +1,158 @@
 import argparse
+import contextlib
+import json
+import os
+import signal
+import socketserver
+import stat
+import sys
+import threading
+from importlib import machinery
+
+import htmlmash
 from htmlmash import load_template
+from htmlmash._importer import TemplateModule, TemplateLoader, _fix_missing_fields
+
+
+class TemplateCache:
+    """Compiled templates, kept between render requests.
+    Template is compiled again when its file or file of any imported template changes.
+    """
+    def __init__(self):
+        self.templates = {}
+        self.modules = {}
+        self.lock = threading.Lock()
+
+    def get(self, file):
+        """Compiled template, compiled again when template file modification time changes.
+        :return: module spec and code object
+        """
+        path = os.path.abspath(file)
+        mtime = os.stat(path).st_mtime_ns
+        cached = self.templates.get(path)
+        if cached is None or cached[0] != mtime:
+            loader = TemplateLoader("", path)
+            spec = machinery.ModuleSpec("", loader, origin=path)
+            spec.has_location = True
+            cached = (mtime, spec, loader.source_to_code(loader.get_data(path), path))
+            self.templates[path] = cached
+        return cached[1:]
+
+    def render(self, request):
+        """Render template for JSON request.
+        :param request: {"template": path, "context": {TemplateModule.__call__ kwargs}}
+        :return: bytes, same as printed in single template mode
+        """
+        request = json.loads(request.decode() if isinstance(request, bytes) else request)
+        context = request.get("context") or {}
+        with self.lock:
+            if self._modified():
+                self._clear()
+            try:
+                spec, code = self.get(request["template"])
+                # context is set before execution, like TemplateModule.__call__ kwargs
+                template = spec.loader.create_module(spec)
+                template.__dict__.update(context)
+                exec(code, template.__dict__)
+                _fix_missing_fields(template)
+                return bytes(template) + b"\n"
+            finally:
+                self._track()
+
+    def _modified(self):
+        for file, mtime in self.modules.values():
+            try:
+                if os.stat(file).st_mtime_ns != mtime:
+                    return True
+            except OSError:
+                return True
+        return False
+
+    def _clear(self):
+        # templates hold references to imported templates, so all of them are reloaded
+        for name in self.modules:
+            sys.modules.pop(name, None)
+        self.modules.clear()
+        self.templates.clear()
+
+    def _track(self):
+        for name, module in list(sys.modules.items()):
+            if isinstance(module, TemplateModule) and name not in self.modules:
+                file = getattr(module, "__file__", None)
+                if file:
+                    with contextlib.suppress(OSError):
+                        self.modules[name] = (file, os.stat(file).st_mtime_ns)
+
+
+def frame(status, payload):
+    """Response frame: ASCII header "<status> <payload length>\\n" followed by payload bytes.
+    """
+    return "{} {}\n".format(status, len(payload)).encode() + payload
+
+
+def serve(rfile, wfile, cache):
+    """Answer JSON line requests from rfile with frames written to wfile.
+    """
+    for line in rfile:
+        if not line.strip():
+            continue
+        try:
+            response = frame("ok", cache.render(line))
+        except Exception as e:
+            response = frame("error", "{}: {}".format(type(e).__name__, e).encode())
+        wfile.write(response)
+        wfile.flush()
+
+
+class _RequestHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        serve(self.rfile, self.wfile, self.server.cache)
+
+
+def serve_socket(path, cache):
+    if os.path.exists(path) and stat.S_ISSOCK(os.stat(path).st_mode):
+        os.unlink(path)
+    server = socketserver.ThreadingUnixStreamServer(path, _RequestHandler)
+    server.daemon_threads = True
+    server.cache = cache
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        with contextlib.suppress(FileNotFoundError):
+            os.unlink(path)
+
 
 parser = argparse.ArgumentParser(prog='htmlmash', description="Process and print template")
-parser.add_argument("template", help="htmlmash template file")
+parser.add_argument("template", nargs="?", help="htmlmash template file")
+parser.add_argument("--worker", action="store_true",
+                    help="keep templates loaded and render JSON line requests from stdin")
+parser.add_argument("--socket", metavar="PATH",
+                    help="in worker mode read requests from unix socket instead of stdin")
 args = parser.parse_args()
-try:
-    template = load_template(args.template)
-    print(template)
-except FileNotFoundError:
-    exit(2)
+
+if (args.worker or args.socket) and args.template is not None:
+    parser.error("template is given in render requests in worker mode")
+elif args.worker or args.socket:
+    # bytecode is validated with mtime in seconds, worker must see every change
+    htmlmash.importer_bytecode_enabled = False
+    cache = TemplateCache()
+    signal.signal(signal.SIGTERM, lambda signum, _frame: sys.exit(0))
+    # template output goes to stdout frames only
+    output = sys.stdout.buffer
+    with contextlib.redirect_stdout(sys.stderr):
+        try:
+            if args.socket:
+                serve_socket(args.socket, cache)
+            else:
+                serve(sys.stdin.buffer, output, cache)
+        except KeyboardInterrupt:
+            pass
+elif args.template is None:
+    parser.error("template is required")
+else:
+    try:
+        template = load_template(args.template)
+        print(template)
+    except FileNotFoundError:
+        exit(2)
@@ -1,4 +1,5 @@
 import html
+import threading
 from htmlmash._importer import TemplateModule
 
 
@@ -36,17 +37,7 @@ class Element:
 
     def __iter__(self):
         for child in self._children:
-            if isinstance(child, TemplateModule):
-                child = child.__template__
-            if not isinstance(child, Element) and hasattr(child, "__call__"):
-                child = child()
-                if isinstance(child, (str, bytes)):
-                    child = Element(None, child)
-            if not isinstance(child, Element) and hasattr(child, "__iter__"):
-                for _child in iter(child):
-                    yield _child
-            if isinstance(child, Element):
-                yield child
+            yield from _expand_child(child)
 
     def __bool__(self):
         return True if self._children else False
@@ -108,7 +99,7 @@ class Element:
 
     @classmethod
     def from_template_module(cls, template_module):
-        return template_module.__template__
+        return template_module.__element__()
 
     @classmethod
     def builder(cls, tag):
@@ -118,6 +109,65 @@ class Element:
         return cls.__builders[tag]
 
 
+class _NamedElement(Element):
+    """Element without tag, identified by name.
+    """
+    __slots__ = ("name",)
+
+    def __init__(self, name, *content, **attributes):
+        super().__init__(None, *content, **attributes)
+        self.name = name
+
+
+class Slot(_NamedElement):
+    """A named placeholder in a layout template.
+    Content of the slot is rendered when the page doesn't fill it.
+    """
+    __slots__ = ()
+
+    def __str__(self):
+        if getattr(_layout_state, "dynamic", False):
+            raise TypeError("slot '{}' must be placed in static part of layout, "
+                            "not in conditions, loops or functions".format(self.name))
+        return super().__str__()
+
+
+class Fill(_NamedElement):
+    """Content for the layout slot with the same name.
+    """
+    __slots__ = ()
+
+
+def _expand_child(child):
+    if isinstance(child, TemplateModule):
+        child = child.__element__()
+    if not isinstance(child, Element) and hasattr(child, "__call__"):
+        child = child()
+        if isinstance(child, (str, bytes)):
+            child = Element(None, child)
+    if not isinstance(child, Element) and hasattr(child, "__iter__"):
+        for _child in iter(child):
+            yield _child
+    if isinstance(child, Element):
+        yield child
+
+
+def _serialize_start_tag(element):
+    output = "<{}".format(element.tag)
+    for key, value in element.attributes.items():
+        if isinstance(value, bool):
+            if value:
+                output += " {}".format(key)
+        else:
+            output += ' {}="{}"'.format(key, html.escape(str(value)))
+    output += ">"
+    return output
+
+
+def _serialize_content(element):
+    return element.text + "".join(str(e) for e in element)
+
+
 def _serialize_element(element):
     if not isinstance(element, Element):
         return ""
@@ -127,14 +177,7 @@ def _serialize_element(element):
     text = element.text
     tail = element.tail
     if tag is not None:
-        output += "<{}".format(tag)
-        for key, value in element.attributes.items():
-            if isinstance(value, bool):
-                if value:
-                    output += " {}".format(key)
-            else:
-                output += ' {}="{}"'.format(key, html.escape(str(value)))
-        output += ">"
+        output += _serialize_start_tag(element)
         if tag.lower() not in VOID_ELEMENTS:
             if text:
                 output += element.text
@@ -154,3 +197,115 @@ def _serialize_element(element):
         if tail:
             output += tail
         return output
+
+
+# Layout #############################################################
+
+_layout_state = threading.local()
+
+
+def _compile_skeleton(element):
+    """Serialize static part of element tree once.
+    :param element: root element of a layout template.
+    :return: list of bytes segments, slots and dynamic children (functions, templates) between them.
+    """
+    segments = []
+    static = []
+
+    def flush():
+        if static:
+            segments.append("".join(static).encode())
+            static.clear()
+
+    def compile_node(node):
+        if isinstance(node, Slot):
+            flush()
+            segments.append(node)
+            if node.tail:
+                static.append(node.tail)
+            return
+        if not isinstance(node, Element):
+            flush()
+            segments.append(node)
+            return
+
+        tag = node.tag
+        if tag is not None:
+            static.append(_serialize_start_tag(node))
+            if tag.lower() not in VOID_ELEMENTS:
+                if node.text:
+                    static.append(node.text)
+                for child in node._children:
+                    compile_node(child)
+                static.append('</{}>'.format(tag))
+            if node.tail:
+                static.append(html.escape(node.tail, False))
+        else:
+            doctype = node.get("doctype")
+            if doctype:
+                static.append("<!DOCTYPE {}>".format(doctype))
+            if node.text:
+                static.append(node.text)
+            for child in node._children:
+                compile_node(child)
+            if node.tail:
+                static.append(node.tail)
+
+    compile_node(element)
+    flush()
+    return segments
+
+
+def _render_skeleton(segments, fills):
+    """Render compiled layout.
+    :param segments: result of _compile_skeleton.
+    :param fills: dict of slot name and Fill element.
+    :return: bytes
+    """
+    output = []
+    for segment in segments:
+        if isinstance(segment, bytes):
+            output.append(segment)
+        elif isinstance(segment, Slot):
+            output.append(_serialize_content(fills.get(segment.name, segment)).encode())
+        else:
+            dynamic = getattr(_layout_state, "dynamic", False)
+            _layout_state.dynamic = True
+            try:
+                output.append("".join(str(e) for e in _expand_child(segment)).encode())
+            finally:
+                _layout_state.dynamic = dynamic
+    return b"".join(output)
+
+
+def _collect_fills(element, template_name, expand=True, fills=None):
+    """Find Fill elements of template with layout.
+    :param element: template element.
+    :param template_name: template name for error message.
+    :param expand: evaluate functions, conditions and loops, otherwise only static content is checked.
+    :param fills: dict to which found fills are added.
+    :return: dict of slot name and Fill element.
+    """
+    if fills is None:
+        fills = {}
+    if element.text.strip():
+        raise _outside_fill_error(template_name)
+    for child in element if expand else element._children:
+        if not isinstance(child, Element):
+            continue
+        if child.tail.strip():
+            raise _outside_fill_error(template_name)
+        if isinstance(child, Fill):
+            if child.name in fills:
+                raise TypeError("duplicate Fill '{}', '{}' template".format(child.name, template_name))
+            fills[child.name] = child
+        elif child.tag is None:
+            _collect_fills(child, template_name, expand, fills)
+        else:
+            raise _outside_fill_error(template_name)
+    return fills
+
+
+def _outside_fill_error(template_name):
+    return TypeError("content outside Fill is not rendered in template with __layout__,"
+                     " '{}' template".format(template_name))
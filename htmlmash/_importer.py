@@ -18,10 +18,43 @@ class TemplateModule(types.ModuleType):
         from htmlmash import Element
         self.Element = Element
         self.__template__ = Element(None)
+        self.__skeleton__ = None
 
     def __str__(self):
+        if self.__dict__.get("__layout__") is not None:
+            return bytes(self).decode()
         return str(self.__template__)
 
+    def __bytes__(self):
+        layout = self.__dict__.get("__layout__")
+        if layout is None:
+            return str(self.__template__).encode()
+
+        from htmlmash._element import _collect_fills
+        return layout.__render__(_collect_fills(self.__template__, self.__name__), self.__name__)
+
+    def __render__(self, fills, template_name=""):
+        """Render this template as a layout, slots are replaced by fills with the same name.
+        Static part of the template is serialized once, at first render.
+        :param fills: dict of slot name and Fill element.
+        :param template_name: name of filled template for error message.
+        :return: bytes
+        """
+        from htmlmash._element import Slot, _compile_skeleton, _render_skeleton
+        if self.__skeleton__ is None:
+            self.__skeleton__ = _compile_skeleton(self.__template__)
+        slots = {segment.name for segment in self.__skeleton__ if isinstance(segment, Slot)}
+        for name in fills:
+            if name not in slots:
+                raise TypeError("Fill '{}' has no Slot in layout '{}', '{}' template".format(
+                    name, self.__name__, template_name))
+        return _render_skeleton(self.__skeleton__, fills)
+
+    def __element__(self):
+        if self.__dict__.get("__layout__") is not None:
+            return self.Element(None, bytes(self))
+        return self.__template__
+
     def __repr__(self):
         name = self.__name__
         return "<TemplateModule{} from '{}'>".format(" '{}'".format(name) if name else name, self.__file__)
@@ -34,14 +67,31 @@ class TemplateModule(types.ModuleType):
 
 
 def _fix_missing_fields(module):
+    layout = module.__dict__.get("__layout__")
+    if layout is not None:
+        _check_layout(module, layout)
     if "__doctype__" in module.__dict__:
         module.__template__.set("doctype", module.__dict__["__doctype__"])
 
 
+def _check_layout(module, layout):
+    if not isinstance(layout, TemplateModule):
+        raise TypeError("__layout__ must be a template module, '{}' template".format(module.__name__))
+    if layout.__dict__.get("__layout__") is not None:
+        raise TypeError("layout can't have own __layout__, '{}' template".format(module.__name__))
+    if "__doctype__" in module.__dict__:
+        raise TypeError("__doctype__ must be set in layout, not in template with __layout__,"
+                        " '{}' template".format(module.__name__))
+
+    from htmlmash._element import _collect_fills
+    _collect_fills(module.__template__, module.__name__, expand=False)
+
+
 # Importer ###########################################################
 
 SOURCE_SUFFIX = ".hpy"
 BYTECODE_SUFFIX = ".hpyc"
+BYTECODE_ENABLED = True
 
 
 def _call_with_frames_removed(f, *args, **kwargs):
@@ -49,6 +99,8 @@ def _call_with_frames_removed(f, *args, **kwargs):
 
 
 class TemplateLoader(importlib.machinery.SourceFileLoader):
+    _code = None
+
     def create_module(self, spec):
         module = TemplateModule(spec.name)
 
@@ -66,10 +118,17 @@ class TemplateLoader(importlib.machinery.SourceFileLoader):
         return module
 
     def exec_module(self, module):
-        #Yes, i'm too lazy to rewrite get_code
-        importlib.machinery.BYTECODE_SUFFIXES.insert(0, BYTECODE_SUFFIX)
-        code = self.get_code(module.__name__)
-        importlib.machinery.BYTECODE_SUFFIXES.remove(BYTECODE_SUFFIX)
+        if BYTECODE_ENABLED:
+            #Yes, i'm too lazy to rewrite get_code
+            importlib.machinery.BYTECODE_SUFFIXES.insert(0, BYTECODE_SUFFIX)
+            code = self.get_code(module.__name__)
+            importlib.machinery.BYTECODE_SUFFIXES.remove(BYTECODE_SUFFIX)
+        else:
+            # instances of template share code compiled once by its loader
+            if self._code is None:
+                path = self.get_filename(module.__name__)
+                self._code = self.source_to_code(self.get_data(path), path)
+            code = self._code
 
         if code is None:
             raise ImportError('cannot load module {!r} when get_code() '